@@ -1,8 +1,14 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
+import multiprocessing
 import os
+import sys
 import radar_viz
 import uvicorn
 from pydantic import BaseModel
@@ -16,7 +22,39 @@ MAPBOX_TOKEN = os.getenv('MAPBOX_TOKEN')
 if not MAPBOX_TOKEN:
     raise ValueError("MAPBOX_TOKEN environment variable is not set")
 
-app = FastAPI()
+# Every server worker has its own merge pool, and every merge runs its own thread pool,
+# so split the CPUs between them instead of giving each level the full CPU count
+CPU_COUNT = os.cpu_count() or 1
+UVICORN_WORKERS = int(os.getenv('UVICORN_WORKERS', CPU_COUNT))
+MERGE_WORKERS = int(os.getenv('MERGE_WORKERS', max(1, CPU_COUNT // UVICORN_WORKERS)))
+MERGE_THREADS = int(os.getenv('MERGE_THREADS', max(1, CPU_COUNT // (UVICORN_WORKERS * MERGE_WORKERS))))
+
+def create_merge_pool() -> ProcessPoolExecutor:
+    """Create the process pool that runs the CPU-bound radar merge."""
+    # Pool processes start lazily, after the event loop and worker threads are running,
+    # so don't fork them from this process; forkserver is unavailable on Windows.
+    start_method = "spawn" if sys.platform == "win32" else "forkserver"
+    return ProcessPoolExecutor(
+        max_workers=MERGE_WORKERS,
+        mp_context=multiprocessing.get_context(start_method)
+    )
+
+def replace_broken_merge_pool(broken_pool: ProcessPoolExecutor):
+    """Replace the merge pool after a worker died, e.g. from an OOM kill or native crash."""
+    # Concurrent requests can all see the same broken pool; only replace it once
+    if app.state.merge_pool is broken_pool:
+        print("Recreating broken merge process pool")
+        app.state.merge_pool = create_merge_pool()
+        broken_pool.shutdown(wait=False)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the CPU-bound radar merge in a process pool so it never blocks the event loop."""
+    app.state.merge_pool = create_merge_pool()
+    yield
+    app.state.merge_pool.shutdown()
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -27,6 +65,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses such as the radar point stream. Compression runs on the
+# event loop, so use level 6 rather than Starlette's default 9: about 3x faster on the
+# multi-MB /generate-radar body for ~5% larger output.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # Define the request model
 class Coordinates(BaseModel):
     center_lat: float
@@ -45,21 +88,25 @@ async def generate_radar(coords: Coordinates):
         print(f"Received coordinates: {coords}")
         
         # Switch from single radar to multiple radars
-        radar_data = radar_viz.generate_plot_from_center(
+        radar_data = await radar_viz.generate_plot_from_center(
             coords.center_lat,
             coords.center_lon,
-            max_distance_km=230  # Use radars within 230km
+            max_distance_km=230,  # Use radars within 230km
+            executor=app.state.merge_pool,
+            merge_threads=MERGE_THREADS,
+            on_executor_broken=replace_broken_merge_pool
         )
         
-        # Restructure the response to match what frontend expects
-        return {
+        # Restructure the response to match what frontend expects.
+        # Returning the response directly skips FastAPI's jsonable_encoder pass over every point.
+        return ORJSONResponse({
             "status": "success",
             "image": {
                 "points": radar_data['points'],
                 "center": radar_data['center'],
                 "stations": radar_data['stations']  # Include stations data
             }
-        }
+        })
         
     except Exception as e:
         import traceback
@@ -70,14 +117,36 @@ async def generate_radar(coords: Coordinates):
 # Get the absolute path to the frontend directory
 FRONTEND_DIR = Path(__file__).parent.parent / "frontend"
 
-# Mount the frontend directories with correct absolute paths
-app.mount("/", StaticFiles(directory=str(FRONTEND_DIR), html=True), name="frontend")
-app.mount("/css", StaticFiles(directory=str(FRONTEND_DIR / "css")), name="css")
-app.mount("/js", StaticFiles(directory=str(FRONTEND_DIR / "js")), name="js")
+# Long-lived browser caching for css/js assets; bump the ?v= query in index.html when they change
+STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers cache css/js assets instead of re-requesting them."""
+
+    def file_response(self, full_path, *args, **kwargs):
+        response = super().file_response(full_path, *args, **kwargs)
+        if str(full_path).endswith(('.css', '.js')):
+            response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+        return response
+
+# Mount the frontend directory with correct absolute path; this also serves /css and /js.
+# In production, consider serving these files from Nginx or a CDN and keeping FastAPI API-only.
+app.mount("/", CachedStaticFiles(directory=str(FRONTEND_DIR), html=True), name="frontend")
 
 @app.route('/favicon.ico')
 def favicon():
     return '', 204  # Return "No Content" status instead of 404
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
+    # Multiple workers require the app to be passed as an import string.
+    # uvloop is not available on Windows, so fall back to the default loop there.
+    uvicorn.run(
+        "main:app",
+        host="127.0.0.1",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=UVICORN_WORKERS,
+        limit_concurrency=1000,
+        timeout_keep_alive=30
+    )
@@ -1,18 +1,35 @@
+import hashlib
 import json
 import os
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import numpy as np
+import orjson
 
 class RadarCache:
-    def __init__(self, cache_dir: str = "cache"):
-        """Initialize the cache directory and index."""
+    def __init__(self, cache_dir: str = "cache", points_max_age: float = 1800):
+        """
+        Initialize the cache directory and index.
+        
+        Args:
+            cache_dir: Root directory of the cache
+            points_max_age: Seconds to keep merged points entries. Radars scan about
+                every 5 minutes, after which an entry is superseded by a newer scan.
+        """
         self.cache_dir = cache_dir
+        self.points_max_age = points_max_age
         self.data_dir = os.path.join(cache_dir, "radar_data")
+        self.points_dir = os.path.join(cache_dir, "points")
         self.index_file = os.path.join(cache_dir, "cache_index.json")
         
+        # Stations are fetched concurrently, so guard index updates within this process
+        self._index_lock = threading.Lock()
+        
         # Create cache directories if they don't exist
         os.makedirs(self.data_dir, exist_ok=True)
+        os.makedirs(self.points_dir, exist_ok=True)
         
         # Load or create cache index
         self.cache_index = self._load_cache_index()
@@ -23,20 +40,38 @@ class RadarCache:
             try:
                 with open(self.index_file, 'r') as f:
                     return json.load(f)
-            except json.JSONDecodeError:
+            except (json.JSONDecodeError, OSError):
                 print("Warning: Cache index corrupted, creating new one")
                 return {}
         return {}
 
     def _save_cache_index(self):
-        """Save the cache index to disk."""
-        with open(self.index_file, 'w') as f:
+        """Save the cache index to disk atomically, so other workers never read a partial file."""
+        tmp_file = f"{self.index_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'w') as f:
             json.dump(self.cache_index, f, indent=2)
+        os.replace(tmp_file, self.index_file)
+
+    def _update_cache_index(self, cache_key: str, entry: Dict):
+        """
+        Add an entry to the cache index.
+        
+        Other server workers write the same index, so reload it from disk and merge
+        before saving instead of overwriting it with this process's view.
+        """
+        with self._index_lock:
+            self.cache_index = {**self.cache_index, **self._load_cache_index(), cache_key: entry}
+            self._save_cache_index()
 
     def get_cache_key(self, station_id: str, date_str: str, time_str: str) -> str:
         """Generate a unique cache key for a radar dataset."""
         return f"{station_id}_{date_str}_{time_str}"
 
+    def get_cache_files(self, cache_key: str) -> Dict[str, str]:
+        """Return the paths of the raw .npy files holding the ref, rng and az arrays."""
+        return {name: os.path.join(self.data_dir, f"{cache_key}.{name}.npy")
+                for name in ('ref', 'rng', 'az')}
+
     def get_cached_data(self, station_id: str, date_str: str, time_str: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
         """
         Retrieve cached radar data if it exists.
@@ -50,21 +85,17 @@ class RadarCache:
             Optional[Tuple]: (ref, rng, az) arrays if cached, None if not found
         """
         cache_key = self.get_cache_key(station_id, date_str, time_str)
+        cache_files = self.get_cache_files(cache_key)
         
-        if cache_key not in self.cache_index:
-            return None
-            
-        cache_file = os.path.join(self.data_dir, f"{cache_key}.npz")
-        
-        if not os.path.exists(cache_file):
-            # Clean up index if file is missing
-            del self.cache_index[cache_key]
-            self._save_cache_index()
+        # The files on disk are the source of truth, so data cached by another
+        # server worker is found even though it isn't in this process's index
+        if not all(os.path.exists(path) for path in cache_files.values()):
             return None
             
         try:
-            data = np.load(cache_file)
-            return (data['ref'], data['rng'], data['az'])
+            # Memory-map rather than reading the arrays fully into RAM
+            return tuple(np.load(cache_files[name], mmap_mode='r', allow_pickle=False)
+                         for name in ('ref', 'rng', 'az'))
         except Exception as e:
             print(f"Error loading cached data: {str(e)}")
             return None
@@ -81,20 +112,103 @@ class RadarCache:
             radar_data: Tuple of (ref, rng, az) arrays to cache
         """
         cache_key = self.get_cache_key(station_id, date_str, time_str)
-        cache_file = os.path.join(self.data_dir, f"{cache_key}.npz")
+        cache_files = self.get_cache_files(cache_key)
         
         try:
-            ref, rng, az = radar_data
-            np.savez(cache_file, ref=ref, rng=rng, az=az)
+            # Write to temporary files first and move them into place, so readers that
+            # memory-map an existing file never see it truncated or half-written.
+            # float32 is ample precision for dBZ, gate distances and azimuths.
+            tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+            for name, array in zip(('ref', 'rng', 'az'), radar_data):
+                with open(cache_files[name] + tmp_suffix, 'wb') as f:
+                    np.save(f, np.asarray(array).astype(np.float32, copy=False), allow_pickle=False)
+            for path in cache_files.values():
+                os.replace(path + tmp_suffix, path)
             
-            # Update index
-            self.cache_index[cache_key] = {
+            # Update index only once all three files are in place
+            self._update_cache_index(cache_key, {
                 'station_id': station_id,
                 'date': date_str,
                 'time': time_str,
                 'cached_at': datetime.utcnow().isoformat()
-            }
-            self._save_cache_index()
+            })
+            
+        except Exception as e:
+            print(f"Error caching radar data: {str(e)}")
+
+    def get_points_key(self, center_lat: float, center_lon: float, max_distance_km: float,
+                       station_scans: List[Tuple[str, str]], grid_size: int,
+                       max_reliable_range: float) -> str:
+        """
+        Generate a cache key for merged points data.
+        
+        Args:
+            center_lat: Center latitude
+            center_lon: Center longitude
+            max_distance_km: Radius used to select stations
+            station_scans: (station_id, scan timestamp) pairs that feed the merge
+            grid_size: Number of merge grid cells per side
+            max_reliable_range: Reliable radar range in meters used by the merge
+        """
+        key = (round(center_lat, 3), round(center_lon, 3), max_distance_km, sorted(station_scans),
+               grid_size, max_reliable_range)
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def get_points(self, points_key: str) -> Optional[Dict]:
+        """
+        Retrieve cached merged points data if it exists.
+        
+        Args:
+            points_key: Key from get_points_key
+            
+        Returns:
+            Optional[Dict]: Cached {'points', 'stations'} data, None if not found
+        """
+        points_file = os.path.join(self.points_dir, f"{points_key}.json")
+        
+        if not os.path.exists(points_file):
+            return None
             
+        try:
+            with open(points_file, 'rb') as f:
+                return orjson.loads(f.read())
         except Exception as e:
-            print(f"Error caching radar data: {str(e)}") 
\ No newline at end of file
+            print(f"Error loading cached points: {str(e)}")
+            return None
+
+    def put_points(self, points_key: str, points_data: Dict):
+        """
+        Cache merged points data to disk.
+        
+        Args:
+            points_key: Key from get_points_key
+            points_data: {'points', 'stations'} data to cache
+        """
+        points_file = os.path.join(self.points_dir, f"{points_key}.json")
+        
+        try:
+            # Write to a temporary file first so concurrent readers never see a partial file
+            tmp_file = f"{points_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(points_data))
+            os.replace(tmp_file, points_file)
+            
+        except Exception as e:
+            print(f"Error caching points: {str(e)}")
+        
+        self._prune_points()
+
+    def _prune_points(self):
+        """Delete merged points entries (and stray temp files) older than points_max_age."""
+        cutoff = time.time() - self.points_max_age
+        try:
+            with os.scandir(self.points_dir) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file() and entry.stat().st_mtime < cutoff:
+                            os.remove(entry.path)
+                    except OSError:
+                        # Already removed by another worker, or still open on Windows
+                        continue
+        except OSError as e:
+            print(f"Error pruning cached points: {str(e)}")
@@ -1,26 +1,102 @@
+from siphon.http_util import session_manager
 from siphon.radarserver import RadarServer
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from functools import partial
+import time
 import numpy as np
 import requests
-from scipy.interpolate import griddata
-from typing import List, Dict, Tuple, Optional, Union, Any
+from requests.adapters import HTTPAdapter
+from scipy.ndimage import map_coordinates
+from typing import Callable, List, Dict, Tuple, Optional, Union, Any
 import numpy.ma as ma
-from utils import calculate_haversine_distance, meters_to_latlon
+from utils import haversine_vec, latlon_to_meters, meters_to_latlon
 from radar_cache import RadarCache
 
 # Initialize cache at module level
 radar_cache = RadarCache()
 
+# In-process cache of the NWS radar station catalog, stored as parallel arrays
+STATIONS_CACHE_TTL = 86400  # 24 hours in seconds
+_STATIONS_CACHE = {'t': 0.0, 'ids': None, 'lats': None, 'lons': None}
+
+# Merge grid parameters
+GRID_SIZE = 1000
+GRID_MAX_RANGE = 230000  # 230 km in meters
+MAX_RELIABLE_RANGE = 80000  # 80 km in meters (≈50 miles)
+
+THREDDS_RADAR_URL = 'https://thredds.ucar.edu/thredds/radarServer/nexrad/level2/IDD/'
+REQUEST_TIMEOUT = (3.05, 10)  # (connect, read) timeouts in seconds
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies REQUEST_TIMEOUT to requests made without an explicit timeout."""
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = REQUEST_TIMEOUT
+        return super().send(request, **kwargs)
+
+
+def _mount_timeout_adapter(session: requests.Session):
+    """Give a session pooled keep-alive connections and a default timeout."""
+    adapter = TimeoutHTTPAdapter(pool_connections=10, pool_maxsize=10)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+# Shared HTTP session so TLS connections are reused across requests
+_SESSION = requests.Session()
+_mount_timeout_adapter(_SESSION)
+
+
+# siphon creates a new session for every catalog query and remote dataset and has
+# no timeout option, so give every session it creates the timeout adapter
+_create_siphon_session = session_manager.create_session
+
+
+def _create_siphon_session_with_timeout() -> requests.Session:
+    """Create a siphon HTTP session with REQUEST_TIMEOUT applied."""
+    session = _create_siphon_session()
+    _mount_timeout_adapter(session)
+    return session
+
+
+session_manager.create_session = _create_siphon_session_with_timeout
+
+# Shared THREDDS radar server client, created on first use
+_RADAR_SERVER = None
+_RADAR_SERVER_LOCK = threading.Lock()
+
+
+def _get_radar_server() -> RadarServer:
+    """
+    Return the shared RadarServer client.
+    
+    Creating a RadarServer downloads the server's metadata and station list, so
+    one instance is reused for all catalog queries.
+    """
+    global _RADAR_SERVER
+    with _RADAR_SERVER_LOCK:
+        if _RADAR_SERVER is None:
+            _RADAR_SERVER = RadarServer(THREDDS_RADAR_URL)
+        return _RADAR_SERVER
+
+
 def raw_to_masked_float(var: Any, data: np.ndarray) -> np.ndarray:
     """
-    Convert raw radar data to masked float values.
+    Convert raw radar data to float values, with NaN marking missing points.
     
     Args:
         var: Variable metadata containing scale and offset information
         data (np.ndarray): Raw radar data array
         
     Returns:
-        np.ndarray: Masked array with converted float values
+        np.ndarray: float32 array with converted values, NaN where data is missing
     """
     # Check for unsigned flag in a more robust way
     is_unsigned = False
@@ -32,48 +108,67 @@ def raw_to_masked_float(var: Any, data: np.ndarray) -> np.ndarray:
         is_unsigned = var.attributes['_Unsigned']
 
     # Convert unsigned data if necessary
+    data = np.asarray(data)
     if is_unsigned:
         data = data & 255
 
-    # Mask missing points
-    data = np.ma.array(data, mask=data == 0)
+    # Missing points are stored as 0
+    missing = data == 0
 
     # Get scale factor and offset, with defaults if not present
     scale_factor = getattr(var, 'scale_factor', 1.0)
     add_offset = getattr(var, 'add_offset', 0.0)
 
     # Convert to float using the scale and offset
-    return data * scale_factor + add_offset
+    values = data.astype(np.float32)
+    values *= np.float32(scale_factor)
+    values += np.float32(add_offset)
+    values[missing] = np.nan
+    return values
 
 
-def get_radars_within_distance(center_lat: float, center_lon: float, max_distance_km: float = 230) -> List[Dict]:
+def _get_stations_arrays() -> Tuple[List[str], np.ndarray, np.ndarray]:
     """
-    Find all radar stations within specified distance from a center point.
+    Return the NWS radar station catalog as parallel (ids, lats, lons) arrays.
+    
+    The catalog rarely changes, so the parsed arrays are kept in-process and
+    only refetched once STATIONS_CACHE_TTL seconds have elapsed.
     """
+    now = time.monotonic()
+    if _STATIONS_CACHE['ids'] is not None and now - _STATIONS_CACHE['t'] < STATIONS_CACHE_TTL:
+        return _STATIONS_CACHE['ids'], _STATIONS_CACHE['lats'], _STATIONS_CACHE['lons']
+    
     url = "https://api.weather.gov/radar/stations"
+    response = _SESSION.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    features = response.json()['features']
+    
+    _STATIONS_CACHE['ids'] = [station['properties']['id'] for station in features]
+    _STATIONS_CACHE['lats'] = np.fromiter((station['geometry']['coordinates'][1] for station in features), dtype=np.float64)
+    _STATIONS_CACHE['lons'] = np.fromiter((station['geometry']['coordinates'][0] for station in features), dtype=np.float64)
+    _STATIONS_CACHE['t'] = now
+    print(f"Refreshed radar station catalog ({len(features)} stations)")
     
+    return _STATIONS_CACHE['ids'], _STATIONS_CACHE['lats'], _STATIONS_CACHE['lons']
+
+
+def get_radars_within_distance(center_lat: float, center_lon: float, max_distance_km: float = 230) -> List[Dict]:
+    """
+    Find all radar stations within specified distance from a center point.
+    """
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        ids, lats, lons = _get_stations_arrays()
         
-        nearby_stations = []
+        # Calculate distances to all stations in a single vectorized pass
+        distances = haversine_vec(center_lat, center_lon, lats, lons)
+        idx = np.where(distances <= max_distance_km)[0]
         
-        # Calculate distances to all stations
-        for station in data['features']:
-            station_coords = station['geometry']['coordinates']
-            station_lon = station_coords[0]
-            station_lat = station_coords[1]
-            
-            distance = calculate_haversine_distance(center_lat, center_lon, station_lat, station_lon)
-            
-            if distance <= max_distance_km:
-                nearby_stations.append({
-                    'id': station['properties']['id'],
-                    'distance': distance,
-                    'lat': station_lat,
-                    'lon': station_lon
-                })
+        nearby_stations = [{
+            'id': ids[i],
+            'distance': float(distances[i]),
+            'lat': float(lats[i]),
+            'lon': float(lons[i])
+        } for i in idx]
             
         print(f"Found {len(nearby_stations)} radar stations within {max_distance_km}km")
         return nearby_stations
@@ -83,16 +178,21 @@ def get_radars_within_distance(center_lat: float, center_lon: float, max_distanc
         raise
 
 
-def get_radar_data(station_id: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
-    """Fetch radar data for a specific station."""
-    try:
-        # First get the timestamp of the latest dataset
-        timestamp = get_radar_timestamp(station_id)
-        if not timestamp:
-            return None
-            
-        date_str, time_str = timestamp
+def get_radar_data(station_id: str, date_str: str, time_str: str,
+                   dataset: Any) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Fetch radar data for a specific station.
+    
+    Args:
+        station_id (str): Radar station ID (e.g., 'KDAX')
+        date_str (str): Date of the latest scan in YYYYMMDD format
+        time_str (str): Time of the latest scan in HHMM format
+        dataset: THREDDS catalog dataset for that scan, only accessed on a cache miss
         
+    Returns:
+        Optional[Tuple]: (ref, rng, az) arrays, None on failure
+    """
+    try:
         # Check cache first
         cached_data = radar_cache.get_cached_data(station_id, date_str, time_str)
         if cached_data is not None:
@@ -101,16 +201,7 @@ def get_radar_data(station_id: str) -> Optional[Tuple[np.ndarray, np.ndarray, np
             
         # If not in cache, fetch from server
         print(f"Fetching new data for {station_id} from {date_str} {time_str}")
-        rs = RadarServer('https://thredds.ucar.edu/thredds/radarServer/nexrad/level2/IDD/')
-        query = rs.query()
-        query.stations(station_id).time(datetime.utcnow())
-        rs.validate_query(query)
-        catalog = rs.get_catalog(query)
-        
-        if not catalog.datasets:
-            return None
-            
-        data = catalog.datasets[0].remote_access()
+        data = dataset.remote_access()
         
         # Extract radar data
         sweep = 0
@@ -130,182 +221,281 @@ def get_radar_data(station_id: str) -> Optional[Tuple[np.ndarray, np.ndarray, np
         return None
 
 
+def _pad_sweep(ref: np.ndarray, az: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Order a sweep's rays by azimuth and pad one ray on each side.
+    
+    Sweeps start at an arbitrary azimuth, so the padding lets interpolation
+    cross the 0/360 seam.
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (ref_ext, az_ext) with az_ext ascending
+    """
+    ref = np.asarray(ref)
+    az = np.asarray(az, dtype=np.float64) % 360
+    
+    order = np.argsort(az)
+    az_sorted = az[order]
+    az_ext = np.concatenate(([az_sorted[-1] - 360], az_sorted, [az_sorted[0] + 360]))
+    ref_ext = np.concatenate((ref[order[-1:]], ref[order], ref[order[:1]]))
+    return ref_ext, az_ext
+
+
+def polar_to_grid(ref: np.ndarray, rng: np.ndarray, az: np.ndarray,
+                  r: np.ndarray, theta: np.ndarray) -> np.ndarray:
+    """
+    Bilinearly sample a radar sweep at arbitrary polar coordinates.
+    
+    The sweep is already on a regular (azimuth, range) grid, so each query point
+    is mapped to fractional ray/gate indices and sampled directly rather than
+    triangulating the scattered samples.
+    
+    Args:
+        ref (np.ndarray): Reflectivity sweep of shape (len(az), len(rng)), NaN where missing
+        rng (np.ndarray): Gate distances in meters
+        az (np.ndarray): Ray azimuths in degrees
+        r (np.ndarray): Query distances from the radar in meters
+        theta (np.ndarray): Query azimuths in degrees clockwise from north, in [0, 360)
+        
+    Returns:
+        np.ndarray: Sampled reflectivity, NaN where missing or outside the sweep
+    """
+    ref_ext, az_ext = _pad_sweep(ref, az)
+    rng = np.asarray(rng, dtype=np.float64)
+    
+    # Fractional ray and gate indices; gates outside the sweep fall out of bounds
+    az_idx = np.interp(theta, az_ext, np.arange(len(az_ext)))
+    rng_idx = np.interp(r, rng, np.arange(len(rng)), left=-1, right=len(rng))
+    
+    return map_coordinates(ref_ext, [az_idx, rng_idx], order=1, mode='constant', cval=np.nan)
+
+
+def _interp_station(radar_data: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                    station: Dict,
+                    x: np.ndarray,
+                    y: np.ndarray,
+                    center_lat: float,
+                    center_lon: float,
+                    max_reliable_range: float) -> Optional[Tuple[slice, slice, np.ndarray]]:
+    """
+    Interpolate one station's sweep onto the merge grid.
+    
+    Only the window of grid cells within reliable range of the station is computed.
+    
+    Returns:
+        Optional[Tuple[slice, slice, np.ndarray]]: (rows, cols, grid_z) where grid_z holds
+        reflectivity values for merge grid window [rows, cols], NaN where missing or beyond
+        reliable range from the station, or None if the station has no usable data
+    """
+    if radar_data is None:
+        return None
+        
+    ref, rng, az = radar_data
+    
+    # Calculate station offset from center in meters
+    station_lat, station_lon = station['lat'], station['lon']
+    station_x, station_y = latlon_to_meters(station_lat, station_lon, center_lat, center_lon)
+    
+    # Window of grid rows/columns within reliable radar range from the station
+    cols = slice(np.searchsorted(x, station_x - max_reliable_range),
+                 np.searchsorted(x, station_x + max_reliable_range, side='right'))
+    rows = slice(np.searchsorted(y, station_y - max_reliable_range),
+                 np.searchsorted(y, station_y + max_reliable_range, side='right'))
+    
+    # Offsets along each axis are 1-D; broadcast them instead of building 2-D grids
+    dx = x[cols] - station_x
+    dy = y[rows] - station_y
+    if dx.size == 0 or dy.size == 0:
+        return None
+    
+    if np.isnan(ref).all():
+        print(f"No valid points in radar data for station at {station_lat}, {station_lon}")
+        return None
+    
+    try:
+        # Polar coordinates of each window cell relative to the radar station
+        distance_from_station = np.hypot(dx[None, :], dy[:, None])
+        
+        # Only sample cells within reliable radar range from the station
+        in_range = distance_from_station <= max_reliable_range
+        
+        # Sample the radar's native (azimuth, range) grid at each cell, NaN where missing
+        grid_z = np.full(distance_from_station.shape, np.nan)
+        dx_in = np.broadcast_to(dx[None, :], in_range.shape)[in_range]
+        dy_in = np.broadcast_to(dy[:, None], in_range.shape)[in_range]
+        theta = np.degrees(np.arctan2(dx_in, dy_in)) % 360
+        grid_z[in_range] = polar_to_grid(ref, rng, az, distance_from_station[in_range], theta)
+        return rows, cols, grid_z
+            
+    except Exception as e:
+        print(f"Error processing radar data for station at {station_lat}, {station_lon}: {str(e)}")
+        return None
+
+
 def merge_radar_data(radar_data_list: List[Tuple[np.ndarray, np.ndarray, np.ndarray]], 
                     center_lat: float, 
                     center_lon: float,
-                    station_positions: List[Dict]) -> List[Dict]:
+                    station_positions: List[Dict],
+                    max_threads: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Merge radar data from multiple stations into a single grid.
+    
+    Stations are interpolated on up to `max_threads` threads (defaults to the CPU count).
+    Returns plain arrays rather than point dicts so the result is cheap to send back
+    from a worker process; see points_from_arrays.
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (lons, lats, values) of the merged points
     """
-    grid_size = 1000
-    max_range = 230000  # 230 km in meters
-    max_reliable_range = 80000  # 80 km in meters (≈50 miles)
+    no_points = (np.empty(0), np.empty(0), np.empty(0))
+    grid_size = GRID_SIZE
+    max_range = GRID_MAX_RANGE
+    max_reliable_range = MAX_RELIABLE_RANGE
     
     # Create grid coordinates in meters
     x = np.linspace(-max_range, max_range, grid_size)
     y = np.linspace(-max_range, max_range, grid_size)
-    X, Y = np.meshgrid(x, y)
     
-    # Initialize merged grid with masked values
-    merged_grid = np.ma.masked_all((grid_size, grid_size))
+    # Initialize merged grid: -inf data with everything masked until a radar covers it
+    merged_data = np.full((grid_size, grid_size), -np.inf)
+    merged_mask = np.ones((grid_size, grid_size), dtype=bool)
     
     # Check if we have any valid radar data
     if not radar_data_list or len(radar_data_list) != len(station_positions):
         print("No valid radar data to merge or mismatched station positions")
-        return []
+        return no_points
     
-    # Process each radar's data
-    for (radar_data, station) in zip(radar_data_list, station_positions):
-        if radar_data is None:
-            continue
-            
-        ref, rng, az = radar_data
-        
-        # Calculate station offset from center in meters
-        station_lat, station_lon = station['lat'], station['lon']
-        station_y = calculate_haversine_distance(center_lat, center_lon, station_lat, center_lon) * 1000
-        station_x = calculate_haversine_distance(center_lat, center_lon, center_lat, station_lon) * 1000
-        
-        if station_lat < center_lat:
-            station_y = -station_y
-        if station_lon < center_lon:
-            station_x = -station_x
-            
-        # Create meshgrid of range and azimuth
-        rng_2d, az_2d = np.meshgrid(rng, az)
-        
-        # Convert from polar to cartesian coordinates (relative to radar station)
-        x_radar = rng_2d * np.sin(np.deg2rad(az_2d)) + station_x
-        y_radar = rng_2d * np.cos(np.deg2rad(az_2d)) + station_y
-        
-        # Calculate distance from center for each point
-        distance_from_center = np.sqrt((X - station_x)**2 + (Y - station_y)**2)
-        
-        # Mask points beyond reliable radar range from the station
-        range_mask = distance_from_center > max_reliable_range
-        
-        # Flatten arrays for interpolation
-        x_flat = x_radar.flatten()
-        y_flat = y_radar.flatten()
-        ref_flat = ref.flatten()
-        
-        # Remove masked points
-        valid = ~np.ma.getmask(ref_flat) if np.ma.is_masked(ref_flat) else np.ones_like(ref_flat, dtype=bool)
-        x_valid = x_flat[valid]
-        y_valid = y_flat[valid]
-        ref_valid = ref_flat[valid]
-        
-        if len(x_valid) == 0:
-            print(f"No valid points in radar data for station at {station_lat}, {station_lon}")
-            continue
-        
-        try:
-            # Create points array for interpolation
-            points = np.column_stack((x_valid, y_valid))
-            
-            # Interpolate
-            grid_z = griddata(points, ref_valid, (X, Y), method='linear')
-            
-            # Convert to masked array and mask invalid values
-            grid_z = np.ma.masked_invalid(grid_z)
-            
-            # Apply range mask
-            grid_z = np.ma.masked_where(range_mask, grid_z)
-            
-            # Update merged grid
-            if merged_grid.mask.all():  # If grid is completely masked
-                merged_grid = grid_z
-            else:
-                # Combine grids, taking maximum value where they overlap
-                merged_grid = np.ma.where(
-                    merged_grid.mask & ~grid_z.mask,
-                    grid_z,
-                    np.ma.where(
-                        ~merged_grid.mask & ~grid_z.mask,
-                        np.maximum(merged_grid, grid_z),
-                        merged_grid
-                    )
-                )
-                
-        except Exception as e:
-            print(f"Error processing radar data for station at {station_lat}, {station_lon}: {str(e)}")
+    # Interpolate each radar onto the grid in parallel; NumPy/SciPy release the GIL
+    # in their native kernels so the stations overlap on multi-core CPUs
+    max_workers = min(len(radar_data_list), max_threads or os.cpu_count() or 1)
+    interp = partial(_interp_station, x=x, y=y, center_lat=center_lat, center_lon=center_lon,
+                     max_reliable_range=max_reliable_range)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        station_grids = list(executor.map(interp, radar_data_list, station_positions))
+    
+    # Merge grids in place, taking the maximum value where radars overlap
+    for station_grid in station_grids:
+        if station_grid is None:
             continue
+        rows, cols, grid_z = station_grid
+        valid = ~np.isnan(grid_z)
+        window = merged_data[rows, cols]
+        np.maximum(window, grid_z, out=window, where=valid)
+        merged_mask[rows, cols] &= ~valid
 
     # Convert merged grid points to lon/lat
-    points_data = []
     try:
-        for i in range(grid_size):
-            for j in range(grid_size):
-                if not merged_grid.mask[i, j]:
-                    # Get the raw dBZ value before normalization
-                    dbz_value = float(merged_grid[i, j])
-                    
-                    # Skip points with dBZ < 5
-                    if dbz_value < 5:
-                        continue
-                    
-                    # Calculate distance from center for this point
-                    point_distance = np.sqrt(X[i,j]**2 + Y[i,j]**2)
-                    
-                    # Skip points beyond reliable range (50 miles ≈ 80km)
-                    if point_distance > max_reliable_range:
-                        continue
-                    
-                    # Convert from meters to longitude/latitude
-                    lat, lon = meters_to_latlon(X[i, j], Y[i, j], center_lat, center_lon)
-                    
-                    # Normalize reflectivity values
-                    normalized_value = max(0, min(50, (dbz_value + 30) * (50/100)))
-                    
-                    point = {
-                        'position': [float(lon), float(lat)],
-                        'value': normalized_value
-                    }
-                    points_data.append(point)
+        # Keep unmasked points with dBZ >= 5 within reliable range (50 miles ≈ 80km) of the center,
+        # combined into one mask; compare squared distances to avoid a sqrt per cell
+        x_sq = x * x
+        y_sq = y * y
+        valid_mask = (
+            ~merged_mask
+            & (merged_data >= 5.0)
+            & (x_sq[None, :] + y_sq[:, None] <= max_reliable_range * max_reliable_range)
+        )
+        row_idx, col_idx = np.nonzero(valid_mask)
+        dbz_values = merged_data[row_idx, col_idx]
+        
+        # Convert from meters to longitude/latitude
+        lats, lons = meters_to_latlon(x[col_idx], y[row_idx], center_lat, center_lon)
+        
+        # Normalize reflectivity values
+        normalized_values = np.clip((dbz_values + 30) * (50/100), 0, 50)
     except Exception as e:
         print(f"Error converting grid to points: {str(e)}")
-        return []
+        return no_points
     
-    print(f"Generated {len(points_data)} merged radar points (filtered dBZ < 5)")
-    if points_data:
+    print(f"Generated {len(normalized_values)} merged radar points (filtered dBZ < 5)")
+    if len(normalized_values):
         print("Sample reflectivity range:", 
-              min(p['value'] for p in points_data),
+              normalized_values.min(),
               "to",
-              max(p['value'] for p in points_data))
+              normalized_values.max())
+    
+    return lons, lats, normalized_values
+
+
+def points_from_arrays(lons: np.ndarray, lats: np.ndarray, values: np.ndarray) -> List[Dict]:
+    """
+    Build the point dicts the frontend expects from merged (lons, lats, values) arrays.
     
-    return points_data
+    Returns:
+        List[Dict]: Points as {'position': [lon, lat], 'value': value}
+    """
+    return [{
+        'position': [lon, lat],
+        'value': value
+    } for lon, lat, value in zip(lons.tolist(), lats.tolist(), values.tolist())]
 
 
-def generate_plot_from_center(center_lat: float, 
-                            center_lon: float, 
-                            max_distance_km: float = 230) -> Dict:
-    """Generate radar visualization data centered on specified coordinates."""
+async def generate_plot_from_center(center_lat: float, 
+                                  center_lon: float, 
+                                  max_distance_km: float = 230,
+                                  executor: Optional[Executor] = None,
+                                  merge_threads: Optional[int] = None,
+                                  on_executor_broken: Optional[Callable[[Executor], None]] = None) -> Dict:
+    """
+    Generate radar visualization data centered on specified coordinates.
+    
+    Per-station THREDDS queries are blocking (siphon), so each one runs in a
+    worker thread and all stations are fetched concurrently. The CPU-bound merge
+    runs on `executor` (e.g. a process pool), or the default thread pool if None,
+    using up to `merge_threads` threads per merge.
+    If a process pool breaks, `on_executor_broken` is called with it so the caller
+    can replace it, and the merge is retried on the default thread pool.
+    """
     print(f"Processing center coordinates: lat={center_lat}, lon={center_lon}")
     
     # Get nearby radar stations
-    stations = get_radars_within_distance(center_lat, center_lon, max_distance_km)
+    stations = await asyncio.to_thread(get_radars_within_distance, center_lat, center_lon, max_distance_km)
     print(f"Found stations: {stations}")
     
-    # Check timestamps and store them
+    # Query each station's catalog once, in parallel, for its latest scan
     station_timestamps = {}
     print("\nChecking radar timestamps:")
-    for station in stations:
-        timestamp = get_radar_timestamp(station['id'])
-        if timestamp:
-            date_str, time_str = timestamp
+    catalog_entries = await asyncio.gather(
+        *(asyncio.to_thread(_fetch_station_catalog, station['id']) for station in stations)
+    )
+    available = []
+    for station, catalog_entry in zip(stations, catalog_entries):
+        if catalog_entry:
+            date_str, time_str, _ = catalog_entry
             station_timestamps[station['id']] = f"{time_str[:2]}:{time_str[2:]} UTC"
             year = date_str[:4]
             month = date_str[4:6]
             day = date_str[6:8]
             print(f"Station {station['id']}: {year}-{month}-{day} {time_str[:2]}:{time_str[2:]} UTC")
+            available.append((station, catalog_entry))
     print()  # Empty line for readability
     
-    radar_data_list = []
-    station_info = []
+    # Merged points are deterministic given the center and the scans that feed them
+    points_key = radar_cache.get_points_key(
+        center_lat, center_lon, max_distance_km,
+        [(station['id'], f"{date_str}_{time_str}") for station, (date_str, time_str, _) in available],
+        GRID_SIZE, MAX_RELIABLE_RANGE
+    )
+    cached_points = await asyncio.to_thread(radar_cache.get_points, points_key)
     
-    for station in stations:
-        try:
-            radar_data = get_radar_data(station['id'])
+    if cached_points is not None:
+        print(f"Using cached points for center {center_lat}, {center_lon}")
+        points_data = cached_points['points']
+        station_info = cached_points['stations']
+    else:
+        radar_data_list = []
+        station_info = []
+        
+        # Fetch radar data for all stations in parallel, reusing the catalog entries above
+        results = await asyncio.gather(
+            *(asyncio.to_thread(get_radar_data, station['id'], *catalog_entry)
+              for station, catalog_entry in available),
+            return_exceptions=True
+        )
+        
+        for (station, _), radar_data in zip(available, results):
+            if isinstance(radar_data, Exception):
+                print(f"Error getting data for station {station['id']}: {str(radar_data)}")
+                continue
             if radar_data is not None:
                 radar_data_list.append(radar_data)
                 station_info.append({
@@ -313,12 +503,32 @@ def generate_plot_from_center(center_lat: float,
                     'timestamp': station_timestamps.get(station['id'], 'N/A')
                 })
                 print(f"Added station {station['id']} to visualization")
-        except Exception as e:
-            print(f"Error getting data for station {station['id']}: {str(e)}")
-            continue
-    
-    # Merge radar data and get points in lon/lat format
-    points_data = merge_radar_data(radar_data_list, center_lat, center_lon, station_info)
+        
+        # Merge radar data and get points in lon/lat format (CPU-bound, keep it off the event loop)
+        loop = asyncio.get_running_loop()
+        try:
+            merged = await loop.run_in_executor(
+                executor, merge_radar_data, radar_data_list, center_lat, center_lon, station_info,
+                merge_threads
+            )
+        except BrokenProcessPool as e:
+            print(f"Merge process pool is broken ({str(e)}), retrying on the default executor")
+            if on_executor_broken is not None:
+                on_executor_broken(executor)
+            merged = await loop.run_in_executor(
+                None, merge_radar_data, radar_data_list, center_lat, center_lon, station_info,
+                merge_threads
+            )
+        points_data = await asyncio.to_thread(points_from_arrays, *merged)
+        
+        # Only cache complete results: the key covers every available station, so a
+        # result missing a failed station would otherwise be served after it recovers.
+        # The write runs in the background so it doesn't delay the response.
+        if radar_data_list and len(station_info) == len(available):
+            asyncio.get_running_loop().run_in_executor(
+                None, radar_cache.put_points, points_key,
+                {'points': points_data, 'stations': station_info}
+            )
     
     result = {
         'points': points_data,
@@ -341,18 +551,18 @@ def generate_plot_from_center(center_lat: float,
     return result
 
 
-def get_radar_timestamp(station_id: str) -> Optional[tuple[str, str]]:
+def _fetch_station_catalog(station_id: str) -> Optional[Tuple[str, str, Any]]:
     """
-    Get the date and timestamp from the most recent dataset for a radar station.
+    Query the THREDDS catalog once for the most recent dataset of a radar station.
     
     Args:
         station_id (str): Radar station ID (e.g., 'KDAX')
         
     Returns:
-        Optional[tuple[str, str]]: Tuple of (date in YYYYMMDD, time in HHMM) if found, None otherwise
+        Optional[Tuple[str, str, Any]]: Tuple of (date in YYYYMMDD, time in HHMM, dataset) if found, None otherwise
     """
     try:
-        rs = RadarServer('https://thredds.ucar.edu/thredds/radarServer/nexrad/level2/IDD/')
+        rs = _get_radar_server()
         query = rs.query()
         query.stations(station_id).time(datetime.utcnow())
         rs.validate_query(query)
@@ -363,7 +573,8 @@ def get_radar_timestamp(station_id: str) -> Optional[tuple[str, str]]:
             return None
             
         # Get the first (most recent) dataset name
-        dataset_name = str(catalog.datasets[0])
+        dataset = catalog.datasets[0]
+        dataset_name = str(dataset)
         # Example format: Level2_KDAX_20240220_0559.ar2v
         
         try:
@@ -380,7 +591,7 @@ def get_radar_timestamp(station_id: str) -> Optional[tuple[str, str]]:
             formatted_time = f"{time_str[:2]}:{time_str[2:]}"
             
             print(f"Station {station_id} latest scan: {formatted_date} {formatted_time} UTC")
-            return (date_str, time_str)
+            return (date_str, time_str, dataset)
             
         except (IndexError, AttributeError) as e:
             print(f"Error parsing timestamp from dataset name: {dataset_name}")
@@ -388,4 +599,21 @@ def get_radar_timestamp(station_id: str) -> Optional[tuple[str, str]]:
             
     except Exception as e:
         print(f"Error getting timestamp for station {station_id}: {str(e)}")
-        return None 
\ No newline at end of file
+        return None
+
+
+def get_radar_timestamp(station_id: str) -> Optional[tuple[str, str]]:
+    """
+    Get the date and timestamp from the most recent dataset for a radar station.
+    
+    Args:
+        station_id (str): Radar station ID (e.g., 'KDAX')
+        
+    Returns:
+        Optional[tuple[str, str]]: Tuple of (date in YYYYMMDD, time in HHMM) if found, None otherwise
+    """
+    catalog_entry = _fetch_station_catalog(station_id)
+    if not catalog_entry:
+        return None
+    date_str, time_str, _ = catalog_entry
+    return (date_str, time_str)
@@ -30,6 +30,7 @@ def calculate_haversine_distance(lat1: float, lon1: float, lat2: float, lon2: fl
 def meters_to_latlon(x: float, y: float, center_lat: float, center_lon: float) -> tuple[float, float]:
     """
     Convert x,y coordinates in meters to latitude/longitude.
+    Also accepts NumPy arrays for x and y, in which case arrays are returned.
     
     Args:
         x (float): X coordinate in meters
@@ -40,7 +41,56 @@ def meters_to_latlon(x: float, y: float, center_lat: float, center_lon: float) -
     Returns:
         tuple[float, float]: (latitude, longitude)
     """
-    delta_lon = x / (111000 * np.cos(np.deg2rad(center_lat)))
-    delta_lat = y / 111000
+    # center_lat is a scalar, so use math rather than NumPy ufunc dispatch and
+    # turn the per-point divides into multiplies
+    inv_scale_lon = 1.0 / (111000.0 * cos(radians(center_lat)))
+    delta_lon = x * inv_scale_lon
+    delta_lat = y * (1.0 / 111000.0)
     
-    return center_lat + delta_lat, center_lon + delta_lon 
\ No newline at end of file
+    return center_lat + delta_lat, center_lon + delta_lon 
+
+def haversine_vec(lat1: float, lon1: float, lats2: np.ndarray, lons2: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Haversine distance from one point to many points.
+    
+    Args:
+        lat1 (float): Latitude of the reference point in degrees
+        lon1 (float): Longitude of the reference point in degrees
+        lats2 (np.ndarray): Latitudes of the target points in degrees
+        lons2 (np.ndarray): Longitudes of the target points in degrees
+        
+    Returns:
+        np.ndarray: Distances to each target point in kilometers
+    """
+    R = 6371  # Earth's radius in kilometers
+    
+    lat1, lon1 = radians(lat1), radians(lon1)
+    lats2, lons2 = np.radians(lats2), np.radians(lons2)
+    
+    dlat = lats2 - lat1
+    dlon = lons2 - lon1
+    
+    a = np.sin(dlat/2)**2 + cos(lat1) * np.cos(lats2) * np.sin(dlon/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+    
+    return R * c
+
+
+
+def latlon_to_meters(lat: float, lon: float, center_lat: float, center_lon: float) -> tuple[float, float]:
+    """
+    Convert latitude/longitude to x,y coordinates in meters, the inverse of meters_to_latlon.
+    
+    Args:
+        lat (float): Latitude in degrees
+        lon (float): Longitude in degrees
+        center_lat (float): Reference latitude
+        center_lon (float): Reference longitude
+        
+    Returns:
+        tuple[float, float]: (x, y) offset from the reference point in meters
+    """
+    x = (lon - center_lon) * 111000.0 * cos(radians(center_lat))
+    y = (lat - center_lat) * 111000.0
+    
+    return x, y
\ No newline at end of file